@@ -1,45 +1,195 @@
 import subprocess
-import hcl2
+import sys
 import os
 import json
+import time
+import functools
+import io
+import re
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
-def fetch_vpc_details(vpc_ids, region):
-    ec2_client = boto3.client('ec2', region_name=region)
-    vpc_details = {}
+# Local cache of fetched VPC details, one JSON file per region. Opt-in only:
+# values served from it may predate an out-of-band change, and the unattended
+# apply would then revert the live VPC to them
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'vpc_importer')
+CACHE_TTL_SECONDS = 600
+
+VPC_ID_RE = re.compile(r'^vpc-[0-9a-f]{8,17}$')
+
+AWS_PROVIDER_LOCK_RE = re.compile(r'provider "registry\.terraform\.io/hashicorp/aws" \{\s*version\s*=\s*"([^"]+)"')
+
+# Concurrent resource operations (imports, refreshes) during plan/apply; Terraform defaults to 10
+TERRAFORM_PARALLELISM = 20
 
-    response = ec2_client.describe_vpcs(VpcIds=vpc_ids)
+@functools.lru_cache(maxsize=None)
+def _ec2_client(region):
+    """Return a shared EC2 client for the region; client construction is the expensive part."""
+    # Adaptive retries absorb RequestLimitExceeded throttling from the concurrent
+    # describe calls, and the pool is sized above their 32 worker threads
+    config = Config(retries={'max_attempts': 10, 'mode': 'adaptive'}, max_pool_connections=50)
+    return boto3.Session().client('ec2', region_name=region, config=config)
 
-    for vpc in response['Vpcs']:
-        vpc_id = vpc['VpcId']
-        cidr_block = vpc['CidrBlock']
-        tags = {tag['Key']: tag['Value'] for tag in vpc.get('Tags', [])}
+def load_vpc_cache(region):
+    """Load cached VPC details for a region, or an empty cache."""
+    cache_path = os.path.join(CACHE_DIR, f"{region}.json")
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read VPC cache file: {e}")
+    return {}
 
-        # Fetch the DNS attributes dynamically
-        dns_support_attr = ec2_client.describe_vpc_attribute(VpcId=vpc_id, Attribute='enableDnsSupport')
-        enable_dns_support = dns_support_attr['EnableDnsSupport']['Value']
+def save_vpc_cache(region, cache):
+    """Atomically write the VPC details cache for a region."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(CACHE_DIR, f"{region}.json")
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+def fetch_vpc_details(vpc_ids, region, assume_default_dns=False, use_cache=False):
+    """Return VPC details, with use_cache serving entries younger than CACHE_TTL_SECONDS from the local cache."""
+    cache = load_vpc_cache(region) if use_cache else {}
+    now = time.time()
+    vpc_details = {}
+    stale_ids = []
+    invalid_ids = []
 
-        dns_hostnames_attr = ec2_client.describe_vpc_attribute(VpcId=vpc_id, Attribute='enableDnsHostnames')
-        enable_dns_hostnames = dns_hostnames_attr['EnableDnsHostnames']['Value']
+    for vpc_id in vpc_ids:
+        # Malformed IDs would make AWS reject the whole describe_vpcs batch
+        if not VPC_ID_RE.match(vpc_id):
+            invalid_ids.append(vpc_id)
+            continue
+        entry = cache.get(vpc_id)
+        if entry and now - entry['fetched_at'] < CACHE_TTL_SECONDS:
+            vpc_details[vpc_id] = tuple(entry['details'])
+        else:
+            stale_ids.append(vpc_id)
 
-        vpc_details[vpc_id] = (cidr_block, tags, enable_dns_support, enable_dns_hostnames)
+    if stale_ids:
+        fetched = describe_vpc_details(stale_ids, region, assume_default_dns)
+        # Assumed DNS settings were never read from AWS, so keep them out of the cache
+        if use_cache and not assume_default_dns:
+            for vpc_id, details in fetched.items():
+                cache[vpc_id] = {"fetched_at": now, "details": list(details)}
+            save_vpc_cache(region, cache)
+        vpc_details.update(fetched)
 
-    missing_vpcs = set(vpc_ids) - set(vpc_details.keys())
+    # Carry on with the VPCs that resolved; the others are left out of
+    # tfvars and imports.tf rather than failing the whole run
+    if invalid_ids:
+        print(f"Warning: Skipping invalid VPC IDs in {region}: {', '.join(invalid_ids)}")
+    missing_vpcs = [vpc_id for vpc_id in vpc_ids if vpc_id not in vpc_details and vpc_id not in invalid_ids]
     if missing_vpcs:
-        raise Exception(f"VPCs not found: {', '.join(missing_vpcs)}")
+        print(f"Warning: Skipping VPCs not found in {region}: {', '.join(missing_vpcs)}")
+
+    return vpc_details
+
+def describe_vpcs(ec2_client, vpc_ids):
+    """Describe VPCs, following NextToken so large ID lists are not silently truncated."""
+    paginator = ec2_client.get_paginator('describe_vpcs')
+    return [vpc for page in paginator.paginate(VpcIds=vpc_ids) for vpc in page['Vpcs']]
+
+def describe_vpcs_skipping_missing(ec2_client, vpc_ids):
+    """Describe VPCs in one batch, retrying once without any IDs AWS reports as not found."""
+    try:
+        return describe_vpcs(ec2_client, vpc_ids)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'InvalidVpcID.NotFound':
+            raise
+        # e.g. "The vpc ID 'vpc-0123abcd' does not exist"
+        not_found = set(re.findall(r'vpc-[0-9a-f]+', e.response['Error']['Message']))
+        if not not_found:
+            raise
+        remaining_ids = [vpc_id for vpc_id in vpc_ids if vpc_id not in not_found]
+        if not remaining_ids:
+            return []
+        return describe_vpcs(ec2_client, remaining_ids)
+
+def describe_vpc_details(vpc_ids, region, assume_default_dns=False):
+    """Fetch CIDR, tags and DNS attributes (or AWS's DNS defaults) for the given VPCs from AWS."""
+    ec2_client = _ec2_client(region)
+    vpc_details = {}
+
+    # Fetch the DNS attributes dynamically. The attribute calls only need the
+    # VPC ID, so fan them out alongside the bulk describe_vpcs call rather
+    # than waiting for it; all 2N + 1 requests are in flight at once. The
+    # trade-off is two wasted calls per well-formed ID that does not exist.
+    with ThreadPoolExecutor(max_workers=min(32, 2 * len(vpc_ids) + 1)) as executor:
+        vpcs_future = executor.submit(describe_vpcs_skipping_missing, ec2_client, vpc_ids)
+        attr_futures = {}
+        if not assume_default_dns:
+            attr_futures = {
+                vpc_id: (
+                    executor.submit(ec2_client.describe_vpc_attribute, VpcId=vpc_id, Attribute='enableDnsSupport'),
+                    executor.submit(ec2_client.describe_vpc_attribute, VpcId=vpc_id, Attribute='enableDnsHostnames'),
+                )
+                for vpc_id in vpc_ids
+            }
+
+        for vpc in vpcs_future.result():
+            vpc_id = vpc['VpcId']
+            cidr_block = vpc['CidrBlock']
+            tags = {tag['Key']: tag['Value'] for tag in vpc.get('Tags', [])}
+
+            if assume_default_dns:
+                # Via the API, only the account's default VPC gets DNS hostnames by default
+                enable_dns_support = True
+                enable_dns_hostnames = vpc.get('IsDefault', False)
+            else:
+                dns_support_future, dns_hostnames_future = attr_futures[vpc_id]
+                enable_dns_support = dns_support_future.result()['EnableDnsSupport']['Value']
+                enable_dns_hostnames = dns_hostnames_future.result()['EnableDnsHostnames']['Value']
+
+            vpc_details[vpc_id] = (cidr_block, tags, enable_dns_support, enable_dns_hostnames)
+
+        # Attribute calls for IDs describe_vpcs did not return are expected to
+        # fail with InvalidVpcID.NotFound; anything else is a real problem
+        for vpc_id, futures in attr_futures.items():
+            if vpc_id in vpc_details:
+                continue
+            for future in futures:
+                error = future.exception()
+                if error and not (isinstance(error, ClientError) and error.response['Error']['Code'] == 'InvalidVpcID.NotFound'):
+                    raise error
 
     return vpc_details
 
 def read_existing_tfvars(tfvars_path):
-    """Read existing terraform.tfvars file if it exists."""
+    """Read existing terraform.tfvars.json file if it exists."""
+    if os.path.exists(tfvars_path):
+        try:
+            with open(tfvars_path, 'r') as f:
+                parsed = json.load(f)
+                return parsed.get('imported_vpc_configs', {}), parsed.get('existing_vpc_ids', [])
+        except Exception as e:
+            # Carrying on would drop every previously imported VPC from
+            # for_each, and the apply would then destroy them
+            raise Exception(f"Could not parse existing tfvars file {tfvars_path}: {e}")
+    return {}, []
+
+def read_legacy_tfvars(tfvars_path):
+    """Read an HCL terraform.tfvars file written by earlier versions of this script."""
     if os.path.exists(tfvars_path):
+        # Only needed for this one-off migration, so not a hard dependency
+        try:
+            import hcl2
+        except ImportError:
+            raise Exception(f"python-hcl2 is required to migrate {tfvars_path} to terraform.tfvars.json")
         try:
             with open(tfvars_path, 'r') as f:
                 content = f.read()
                 parsed = hcl2.loads(content)
                 return parsed.get('imported_vpc_configs', {}), parsed.get('existing_vpc_ids', [])
         except Exception as e:
-            print(f"Warning: Could not parse existing tfvars file: {e}")
+            # Migrating would delete the file and drop its VPCs from for_each,
+            # so the apply would destroy them; stop instead
+            raise Exception(f"Could not parse existing tfvars file {tfvars_path}, fix it before migrating: {e}")
     return {}, []
 
 def create_directory_structure(base_path):
@@ -50,16 +200,40 @@ def create_directory_structure(base_path):
     os.makedirs(child_module, exist_ok=True)
     return parent_module, child_module
 
+def write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that content."""
+    # Leaving unchanged files alone keeps their mtimes stable, which needs_init relies on
+    try:
+        with open(path, "r") as f:
+            if f.read() == content:
+                return
+    except FileNotFoundError:
+        pass
+    with open(path, "w") as f:
+        f.write(content)
+
 def create_terraform_files(parent_module, child_module):
     """Create all necessary Terraform files."""
     # Parent Module files
     parent_main_tf = """
+terraform {
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = "~> 6.0"
+    }
+  }
+}
     provider "aws" {
   region = var.aws_region
 }
     resource "aws_vpc" "my_existing_vpc" {
     for_each = var.imported_vpc_configs
     
+    # The per-resource region argument needs AWS provider 6.x. State written
+    # by 5.x is upgraded to 6.x by the next apply, which is not reversible;
+    # review the AWS provider 6.0 upgrade guide before moving existing state
+    region               = each.value.region
     cidr_block           = each.value.cidr_block
     enable_dns_support   = each.value.enable_dns_support
     enable_dns_hostnames = each.value.enable_dns_hostnames
@@ -73,20 +247,19 @@ def create_terraform_files(parent_module, child_module):
         enable_dns_support   = bool
         enable_dns_hostnames = bool
         tags                 = map(string)
+        region               = optional(string)
     }))
     default = {}
 }
 
 variable "aws_region" {
-    description = "AWS region"
+    description = "Default AWS region, used for VPCs without their own region"
     type        = string
 }"""
     
     # Create parent module files
-    with open(os.path.join(parent_module, "main.tf"), "w") as f:
-        f.write(parent_main_tf)
-    with open(os.path.join(parent_module, "variables.tf"), "w") as f:
-        f.write(parent_variables_tf)
+    write_if_changed(os.path.join(parent_module, "main.tf"), parent_main_tf)
+    write_if_changed(os.path.join(parent_module, "variables.tf"), parent_variables_tf)
     
     # Child Module files
     child_main_tf = """module "imported_vpc" {
@@ -103,12 +276,13 @@ variable "aws_region" {
         enable_dns_support   = bool
         enable_dns_hostnames = bool
         tags                 = map(string)
+        region               = optional(string)
     }))
     default = {}
 }
 
 variable "aws_region" {
-    description = "AWS region"
+    description = "Default AWS region, used for VPCs without their own region"
     type        = string
 }
 
@@ -119,68 +293,144 @@ variable "existing_vpc_ids" {
 }"""
     
     backend_tf = """terraform {
+    required_version = ">= 1.5"
     backend "local" {}
 }"""
     
     # Create child module files
-    with open(os.path.join(child_module, "main.tf"), "w") as f:
-        f.write(child_main_tf)
-    with open(os.path.join(child_module, "variables.tf"), "w") as f:
-        f.write(child_variables_tf)
-    with open(os.path.join(child_module, "backend.tf"), "w") as f:
-        f.write(backend_tf)
+    write_if_changed(os.path.join(child_module, "main.tf"), child_main_tf)
+    write_if_changed(os.path.join(child_module, "variables.tf"), child_variables_tf)
+    write_if_changed(os.path.join(child_module, "backend.tf"), backend_tf)
 
-def create_or_update_tfvars(child_module, vpc_details, region):
-    """Create or update terraform.tfvars file preserving existing configurations."""
-    tfvars_path = os.path.join(child_module, "terraform.tfvars")
+def create_or_update_tfvars(child_module, vpc_details_by_region, region):
+    """Create or update terraform.tfvars.json file preserving existing configurations."""
+    tfvars_path = os.path.join(child_module, "terraform.tfvars.json")
+    legacy_tfvars_path = os.path.join(child_module, "terraform.tfvars")
     
-    # Read existing configurations
-    existing_configs, existing_vpc_ids = read_existing_tfvars(tfvars_path)
+    # Read existing configurations, migrating an HCL tfvars file if that is all there is
+    migrate_legacy = not os.path.exists(tfvars_path) and os.path.exists(legacy_tfvars_path)
+    if migrate_legacy:
+        existing_configs, existing_vpc_ids = read_legacy_tfvars(legacy_tfvars_path)
+    else:
+        existing_configs, existing_vpc_ids = read_existing_tfvars(tfvars_path)
     
     # Update configurations with new VPC details
-    for vpc_id, (cidr_block, tags, enable_dns_support, enable_dns_hostnames) in vpc_details.items():
-        existing_configs[vpc_id] = {
-            "cidr_block": cidr_block,
-            "enable_dns_support": enable_dns_support,
-            "enable_dns_hostnames": enable_dns_hostnames,
-            "tags": tags
-        }
-        if vpc_id not in existing_vpc_ids:
-            existing_vpc_ids.append(vpc_id)
-    
-    # Create the configuration string for each VPC
-    vpc_configs = []
-    for vid, config in existing_configs.items():
-        # Format tags
-        tag_lines = []
-        for k, v in config['tags'].items():
-            tag_lines.append(f'      {k} = "{v}"')
-        formatted_tags = '\n'.join(tag_lines)
-        
-        vpc_config = f"""  "{vid}" = {{
-    cidr_block           = "{config['cidr_block']}"
-    enable_dns_support   = {str(config['enable_dns_support']).lower()}
-    enable_dns_hostnames = {str(config['enable_dns_hostnames']).lower()}
-    tags = {{
-{formatted_tags}
-    }}
-  }}"""
-        vpc_configs.append(vpc_config)
+    known_vpc_ids = set(existing_vpc_ids)
+    for vpc_region, vpc_details in vpc_details_by_region.items():
+        for vpc_id, (cidr_block, tags, enable_dns_support, enable_dns_hostnames) in vpc_details.items():
+            existing_configs[vpc_id] = {
+                "cidr_block": cidr_block,
+                "enable_dns_support": enable_dns_support,
+                "enable_dns_hostnames": enable_dns_hostnames,
+                "tags": tags,
+                "region": vpc_region
+            }
+            if vpc_id not in known_vpc_ids:
+                known_vpc_ids.add(vpc_id)
+                existing_vpc_ids.append(vpc_id)
+    
+    tfvars = {
+        "aws_region": region,
+        "existing_vpc_ids": existing_vpc_ids,
+        "imported_vpc_configs": existing_configs
+    }
     
-    # Join all VPC configurations
-    all_vpc_configs = '\n'.join(vpc_configs)
+    with open(tfvars_path, "w") as f:
+        json.dump(tfvars, f, indent=2)
     
-    # Create final tfvars content
-    tfvars_content = f"""aws_region = "{region}"
+    # Terraform loads both files, so drop the HCL one once it has been migrated
+    if migrate_legacy:
+        os.remove(legacy_tfvars_path)
 
-existing_vpc_ids = {json.dumps(existing_vpc_ids)}
+def create_import_blocks(child_module, vpc_ids_by_region, region):
+    """Create imports.tf so all VPCs are imported within a single plan/apply."""
+    buf = io.StringIO()
+    for vpc_region, vpc_ids in vpc_ids_by_region.items():
+        for vpc_id in vpc_ids:
+            # VPCs outside the provider's default region are imported as "<id>@<region>"
+            import_id = vpc_id if vpc_region == region else f"{vpc_id}@{vpc_region}"
+            buf.write(f"""import {{
+    to = module.imported_vpc.aws_vpc.my_existing_vpc[{json.dumps(vpc_id)}]
+    id = {json.dumps(import_id)}
+}}
 
-imported_vpc_configs = {{
-{all_vpc_configs}
-}}"""
-    
-    with open(tfvars_path, "w") as f:
-        f.write(tfvars_content)
+""")
+
+    write_if_changed(os.path.join(child_module, "imports.tf"), buf.getvalue())
+
+def fetch_all_vpc_details(vpc_ids_by_region, assume_default_dns=False, use_cache=False):
+    """Fetch VPC details for every region concurrently, returning {region: vpc_details}."""
+    with ThreadPoolExecutor(max_workers=max(1, len(vpc_ids_by_region))) as executor:
+        futures = {
+            vpc_region: executor.submit(fetch_vpc_details, vpc_ids, vpc_region, assume_default_dns, use_cache)
+            for vpc_region, vpc_ids in vpc_ids_by_region.items()
+        }
+        return {vpc_region: future.result() for vpc_region, future in futures.items()}
+
+def keep_state_dns_settings(child_module, vpc_details_by_region):
+    """Replace assumed DNS settings with the ones Terraform state already records for those VPCs."""
+    state_path = os.path.join(child_module, "terraform.tfstate")
+    if not os.path.exists(state_path):
+        return
+    with open(state_path, "r") as f:
+        state = json.load(f)
+
+    for resource in state.get('resources', []):
+        if resource.get('module') != 'module.imported_vpc' or resource.get('type') != 'aws_vpc':
+            continue
+        for instance in resource.get('instances', []):
+            vpc_id = instance.get('index_key')
+            attributes = instance.get('attributes', {})
+            for vpc_details in vpc_details_by_region.values():
+                if vpc_id in vpc_details:
+                    cidr_block, tags, _, _ = vpc_details[vpc_id]
+                    vpc_details[vpc_id] = (cidr_block, tags, attributes['enable_dns_support'], attributes['enable_dns_hostnames'])
+
+def check_provider_lock(child_module):
+    """Stop if .terraform.lock.hcl still pins the AWS provider below 6.0."""
+    lock_file = os.path.join(child_module, ".terraform.lock.hcl")
+    if not os.path.exists(lock_file):
+        return
+    with open(lock_file, "r") as f:
+        match = AWS_PROVIDER_LOCK_RE.search(f.read())
+    # Moving to 6.x upgrades the existing state, so leave that decision to the user
+    if match and int(match.group(1).split('.')[0]) < 6:
+        raise Exception(
+            f"{lock_file} pins the AWS provider to {match.group(1)}, but this script needs 6.x. "
+            f"Review the AWS provider 6.0 upgrade guide, then run `terraform init -upgrade` in {child_module} and re-run."
+        )
+
+def needs_init(child_module, parent_module):
+    """Check whether `terraform init` must run, i.e. providers are missing or the config changed since."""
+    lock_file = os.path.join(child_module, ".terraform.lock.hcl")
+    stamp_file = os.path.join(child_module, ".terraform", "init.stamp")
+    if not os.path.isdir(os.path.join(child_module, ".terraform", "providers")) or not os.path.exists(lock_file):
+        return True
+    # Terraform leaves the lock file untouched when nothing changes, so its
+    # mtime alone cannot tell us when init last ran; the stamp records that
+    if not os.path.exists(stamp_file):
+        return True
+
+    # Provider requirements, the backend and module sources all live in these files
+    init_inputs = [
+        os.path.join(child_module, "main.tf"),
+        os.path.join(child_module, "backend.tf"),
+        os.path.join(parent_module, "main.tf"),
+    ]
+    init_mtime = os.path.getmtime(stamp_file)
+    return any(os.path.getmtime(path) > init_mtime for path in init_inputs)
+
+def mark_initialized(child_module):
+    """Record a successful `terraform init` for needs_init."""
+    with open(os.path.join(child_module, ".terraform", "init.stamp"), "w"):
+        pass
+
+def run_terraform(*args):
+    """Run a terraform command, streaming its output straight to the console."""
+    # Terraform writes to the inherited stdout directly; flush our own buffered
+    # messages first so they appear before its output rather than after
+    sys.stdout.flush()
+    subprocess.run(['terraform', *args], check=True)
 
 def main():
     """Main function to run the script."""
@@ -194,53 +444,77 @@ def main():
     create_terraform_files(parent_module, child_module)
     
     # Configuration
-    region = "us-east-1"  # Change this to your desired region
-    vpc_ids = [  # List your VPC IDs here
-        "vpc-0e4573ffe1ccab421",
-        "vpc-07bd81c8b6c7c9b6d",
-        # Add more VPC IDs as needed
-    ]
+    region = "us-east-1"  # Change this to your default region
+    vpc_ids_by_region = {  # List your VPC IDs here, grouped by region
+        "us-east-1": [
+            "vpc-0e4573ffe1ccab421",
+            "vpc-07bd81c8b6c7c9b6d",
+        ],
+        # Add more regions and VPC IDs as needed
+    }
+    # Skip reading DNS settings and assume the API defaults (support on, hostnames
+    # only on the default VPC). Only safe for VPCs created through the API/CLI
+    # with defaults: e.g. the console's "VPC and more" wizard enables hostnames.
+    # VPCs already in Terraform state keep the settings recorded there
+    assume_default_dns = False
+    # Reuse VPC details fetched within the last CACHE_TTL_SECONDS instead of
+    # calling AWS; any out-of-band change made in that window is reverted by
+    # the apply, so only enable this for repeated runs against unchanged VPCs
+    use_vpc_cache = False
     
     try:
-        # Fetch VPC details
-        print(f"Fetching details for VPCs: {', '.join(vpc_ids)}...")
-        vpc_details = fetch_vpc_details(vpc_ids, region)
+        # Fetch VPC details, all regions in parallel
+        for vpc_region, ids in vpc_ids_by_region.items():
+            print(f"Fetching details for VPCs in {vpc_region}: {', '.join(ids)}...")
+        vpc_details_by_region = fetch_all_vpc_details(vpc_ids_by_region, assume_default_dns, use_vpc_cache)
+
+        # Only import the VPCs that were actually found
+        found_vpc_ids_by_region = {
+            vpc_region: list(vpc_details) for vpc_region, vpc_details in vpc_details_by_region.items()
+        }
+        vpc_ids = [vpc_id for ids in found_vpc_ids_by_region.values() for vpc_id in ids]
+        if not vpc_ids:
+            raise Exception("None of the listed VPCs were found")
+        
+        # Never push guessed DNS settings onto VPCs Terraform already manages
+        if assume_default_dns:
+            keep_state_dns_settings(child_module, vpc_details_by_region)
         
         # Create or update tfvars
-        create_or_update_tfvars(child_module, vpc_details, region)
+        create_or_update_tfvars(child_module, vpc_details_by_region, region)
+
+        # Declare the VPC imports; Terraform performs them during plan/apply
+        create_import_blocks(child_module, found_vpc_ids_by_region, region)
         
-        # Print out the contents of the terraform.tfvars for debugging
-        with open(os.path.join(child_module, "terraform.tfvars"), "r") as f:
-            print(f"terraform.tfvars content:\n{f.read()}")
+        # Print out the contents of the terraform.tfvars.json for debugging
+        with open(os.path.join(child_module, "terraform.tfvars.json"), "r") as f:
+            print(f"terraform.tfvars.json content:\n{f.read()}")
 
         # Change to Child_Module directory
         os.chdir(child_module)
         
-        # Initialize Terraform
-        print("Initializing Terraform...")
-        subprocess.run(['terraform', 'init'], check=True)
-        
-        # Import VPCs
-        for vpc_id in vpc_ids:
-            print(f"Importing VPC {vpc_id}...")
-            import_cmd = [
-                'terraform', 'import',
-                f'module.imported_vpc.aws_vpc.my_existing_vpc["{vpc_id}"]',
-                vpc_id
-            ]
-            result = subprocess.run(import_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"Import Output for {vpc_id}:", result.stdout)
-                print(f"Import Error for {vpc_id}:", result.stderr)
-            else:
-                print(f"Import successful for {vpc_id}!")
+        # Initialize Terraform, unless a previous run already did so for this config
+        check_provider_lock(child_module)
+        if needs_init(child_module, parent_module):
+            print("Initializing Terraform...")
+            run_terraform('init')
+            mark_initialized(child_module)
+        else:
+            print("Terraform already initialized, skipping init.")
         
-        # Plan and apply
-        print("Planning changes...")
-        subprocess.run(['terraform', 'plan'], check=True)
+        # Plan and apply, importing any VPCs not yet in state
+        print(f"Planning changes (importing VPCs: {', '.join(vpc_ids)})...")
+        # Refresh is skipped because imports read their VPCs anyway and the VPCs
+        # fetched from AWS this run already match tfvars. VPCs served from the
+        # opt-in cache or carried over from earlier runs are not re-read, so AWS
+        # changes to them go unnoticed. Apply reuses the saved plan instead of
+        # planning a second time.
+        run_terraform('plan', '-refresh=false', '-out=tfplan', f'-parallelism={TERRAFORM_PARALLELISM}')
         
         print("Applying changes...")
-        subprocess.run(['terraform', 'apply', '-auto-approve'], check=True)
+        run_terraform('apply', f'-parallelism={TERRAFORM_PARALLELISM}', 'tfplan')
+        # An applied plan is stale; don't leave it next to the config
+        os.remove(os.path.join(child_module, "tfplan"))
         
         print("VPC imports completed successfully!")
         